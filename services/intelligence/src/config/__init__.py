@@ -10,6 +10,18 @@ class Config:
     """Application configuration"""
     PORT = int(os.getenv("PORT", 8000))
     ENV = os.getenv("ENV", "development")
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    REDIS_HOST = os.getenv("REDIS_HOST")
+    REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
+    REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+    # Redis key operators set to drain this instance (see health checks)
+    REDIS_MAINT_KEY = os.getenv("REDIS_MAINT_KEY")
+    # Health check cache TTLs in seconds
+    HEALTH_TTL_DB = float(os.getenv("HEALTH_TTL_DB", 5.0))
+    HEALTH_TTL_REDIS = float(os.getenv("HEALTH_TTL_REDIS", 5.0))
+    HEALTH_TTL_MEMORY = float(os.getenv("HEALTH_TTL_MEMORY", 0.5))
+    # Upper bound in seconds for a single dependency check
+    HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", 3.0))
     # Add more configuration as needed
 
 
@@ -2,14 +2,19 @@
 Health check service for Intelligence Service
 Provides Kubernetes-compatible health endpoints
 """
+import asyncio
+import logging
+import threading
 import time
-import os
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, Optional, Callable, Tuple
+from datetime import datetime, timezone
+import orjson
 import psutil
 
+from config import Config
+
 try:
-    from redis import Redis
+    from redis import Redis, ConnectionPool
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
@@ -21,14 +26,135 @@ try:
 except ImportError:
     POSTGRES_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
+# Floor for check TTLs and the refresh interval; a zero or negative value from
+# the environment would otherwise turn the background loop into a busy loop
+MIN_CHECK_INTERVAL = 0.1
+
+# (epoch second, ISO string) of the last formatted timestamp
+_ts_cache: Tuple[int, str] = (0, "")
+
+
+def now_iso() -> str:
+    """
+    Current UTC time as an ISO-8601 string at one-second resolution.
+    Formatting happens at most once per second; other calls reuse the string.
+    """
+    global _ts_cache
+    t = int(time.time())
+    if t != _ts_cache[0]:
+        _ts_cache = (t, datetime.fromtimestamp(t, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"))
+    return _ts_cache[1]
+
 
 class HealthCheckService:
     """Health check service for dependencies"""
     
     def __init__(self):
-        self.start_time = time.time()
+        # Uptime is measured on the monotonic clock so NTP steps can't skew it
+        self._start_monotonic = time.monotonic()
+        # Seconds each check result is reused before the dependency is probed again
+        self._ttls: Dict[str, float] = {
+            "database": max(Config.HEALTH_TTL_DB, MIN_CHECK_INTERVAL),
+            "redis": max(Config.HEALTH_TTL_REDIS, MIN_CHECK_INTERVAL),
+            "memory": max(Config.HEALTH_TTL_MEMORY, MIN_CHECK_INTERVAL),
+        }
+        # A check still running after this many seconds is reported unhealthy
+        self._check_timeout = Config.HEALTH_CHECK_TIMEOUT
+        # Environment is fixed for the life of the process, so read it once
+        self._environment = Config.ENV
+        self._database_url = Config.DATABASE_URL
+        self._redis_host = Config.REDIS_HOST
+        self._redis_port = Config.REDIS_PORT
+        self._redis_password = Config.REDIS_PASSWORD
+        self._redis_maint_key = Config.REDIS_MAINT_KEY
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Latest result of perform_all_checks, replaced atomically by refresh()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        # /health response body for the current snapshot, serialized once per refresh
+        self._body_cache: bytes = b""
+        # Refresh currently running, shared by concurrent callers (singleflight)
+        self._inflight: Optional["asyncio.Task[Dict[str, Any]]"] = None
+        
+        # One pooled client for the process; ping() reuses an open connection
+        self._redis: Optional["Redis"] = None
+        if REDIS_AVAILABLE and self._redis_host:
+            self._redis = Redis(connection_pool=ConnectionPool(
+                host=self._redis_host,
+                port=self._redis_port,
+                password=self._redis_password,
+                socket_connect_timeout=2,
+                socket_timeout=2,
+                max_connections=4
+            ))
+        
+        # Postgres pool is opened on first check so startup never blocks on the DB
+        self._pg_pool: Optional["pool.ThreadedConnectionPool"] = None
+        self._pg_pool_lock = threading.Lock()
+        
+        # Process handle and total RAM don't change at runtime, so each memory
+        # check only needs to read this process's RSS
+        self._process = psutil.Process()
+        self._total_memory = psutil.virtual_memory().total
+    
+    def _get_pg_pool(self, database_url: str) -> "pool.ThreadedConnectionPool":
+        """Return the shared Postgres pool, creating it on first use"""
+        with self._pg_pool_lock:
+            if self._pg_pool is None:
+                # connect_timeout only bounds connecting: keepalives drop a
+                # half-open pooled connection, statement_timeout a stuck query
+                self._pg_pool = pool.ThreadedConnectionPool(
+                    1, 4,
+                    dsn=database_url,
+                    connect_timeout=2,
+                    keepalives=1,
+                    keepalives_idle=5,
+                    keepalives_interval=2,
+                    keepalives_count=2,
+                    options="-c statement_timeout=2000"
+                )
+            return self._pg_pool
+    
+    async def _cached(self, name: str, fn: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return the cached result for a check, running it only when older
+        than the check's TTL. The check itself is blocking I/O, so it runs in
+        a worker thread, bounded by the check timeout so a hung dependency
+        can't stall the refresh. Results carry "cached" and "age_ms" so
+        operators can see how stale a reported status is.
+        """
+        entry = self._cache.get(name)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self._ttls[name]:
+                return {**entry[1], "cached": True, "age_ms": round(age * 1000, 2)}
+        
+        try:
+            result = await asyncio.wait_for(asyncio.to_thread(fn), timeout=self._check_timeout)
+        except asyncio.TimeoutError:
+            # The worker thread can't be cancelled; it finishes or fails on its own
+            result = {
+                "name": name,
+                "status": "unhealthy",
+                "message": f"Check timed out after {self._check_timeout}s"
+            }
+        self._cache[name] = (time.monotonic(), result)
+        return {**result, "cached": False, "age_ms": 0.0}
+    
+    async def check_database(self) -> Dict[str, Any]:
+        """Check database connectivity (cached)"""
+        return await self._cached("database", self._check_database)
+    
+    async def check_redis(self) -> Dict[str, Any]:
+        """Check Redis connectivity (cached)"""
+        return await self._cached("redis", self._check_redis)
+    
+    async def check_memory(self) -> Dict[str, Any]:
+        """Check memory usage (cached)"""
+        return await self._cached("memory", self._check_memory)
     
-    def check_database(self) -> Dict[str, Any]:
+    def _check_database(self) -> Dict[str, Any]:
         """Check database connectivity"""
         if not POSTGRES_AVAILABLE:
             return {
@@ -39,18 +165,29 @@ class HealthCheckService:
         
         start_time = time.time()
         try:
-            # Try to connect to database
-            # In production, use connection pool
-            database_url = os.getenv("DATABASE_URL")
-            if not database_url:
+            if not self._database_url:
                 return {
                     "name": "database",
                     "status": "unhealthy",
                     "message": "DATABASE_URL not configured"
                 }
             
-            # Simple connection test (in production, use connection pool)
-            # This is a placeholder - implement actual connection check
+            pg_pool = self._get_pg_pool(self._database_url)
+            conn = pg_pool.getconn()
+            broken = False
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                    cur.fetchone()
+                # Leave the connection idle instead of inside an open transaction
+                conn.rollback()
+            except Exception:
+                broken = True
+                raise
+            finally:
+                # Drop connections that failed so the pool reconnects next time
+                pg_pool.putconn(conn, close=broken)
+            
             latency = (time.time() - start_time) * 1000
             
             return {
@@ -68,7 +205,7 @@ class HealthCheckService:
                 "latency": round(latency, 2)
             }
     
-    def check_redis(self) -> Dict[str, Any]:
+    def _check_redis(self) -> Dict[str, Any]:
         """Check Redis connectivity"""
         if not REDIS_AVAILABLE:
             return {
@@ -77,31 +214,36 @@ class HealthCheckService:
                 "message": "Redis client not available"
             }
         
+        if self._redis is None:
+            return {
+                "name": "redis",
+                "status": "degraded",
+                "message": "Redis not configured"
+            }
+        
         start_time = time.time()
         try:
-            redis_host = os.getenv("REDIS_HOST")
-            redis_port = int(os.getenv("REDIS_PORT", "6379"))
-            redis_password = os.getenv("REDIS_PASSWORD")
+            # Test connection; with a maintenance key configured, check it in
+            # the same round-trip so operators can drain this instance.
+            # transaction=False batches the commands without MULTI/EXEC.
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.ping()
+            if self._redis_maint_key:
+                pipe.exists(self._redis_maint_key)
+            results = pipe.execute()
+            in_maintenance = bool(results[1]) if self._redis_maint_key else False
+            latency = (time.time() - start_time) * 1000
             
-            if not redis_host:
+            if in_maintenance:
+                # Still serving (degraded for /health), but readiness drains the instance
                 return {
                     "name": "redis",
                     "status": "degraded",
-                    "message": "Redis not configured"
+                    "message": "maintenance flag set",
+                    "maintenance": True,
+                    "latency": round(latency, 2)
                 }
             
-            redis_client = Redis(
-                host=redis_host,
-                port=redis_port,
-                password=redis_password,
-                socket_connect_timeout=2,
-                socket_timeout=2
-            )
-            
-            # Test connection
-            redis_client.ping()
-            latency = (time.time() - start_time) * 1000
-            
             return {
                 "name": "redis",
                 "status": "healthy",
@@ -117,14 +259,13 @@ class HealthCheckService:
                 "latency": round(latency, 2)
             }
     
-    def check_memory(self) -> Dict[str, Any]:
+    def _check_memory(self) -> Dict[str, Any]:
         """Check memory usage"""
         try:
-            process = psutil.Process()
-            memory_info = process.memory_info()
-            memory_percent = process.memory_percent()
+            rss = self._process.memory_info().rss
+            memory_percent = rss * 100.0 / self._total_memory
             
-            heap_used_mb = round(memory_info.rss / 1024 / 1024, 2)
+            heap_used_mb = round(rss / 1024 / 1024, 2)
             
             # Consider unhealthy if memory usage > 90%
             status = "unhealthy" if memory_percent > 90 else "degraded" if memory_percent > 75 else "healthy"
@@ -145,17 +286,65 @@ class HealthCheckService:
                 "message": f"Memory check failed: {str(e)}"
             }
     
-    def perform_all_checks(self) -> Dict[str, Any]:
-        """Perform all health checks"""
-        checks = [
+    async def run_loop(self, interval: Optional[float] = None) -> None:
+        """
+        Refresh the health snapshot every `interval` seconds until cancelled.
+        Defaults to the shortest check TTL, so each check is re-probed as soon
+        as its own TTL expires and the reported "age_ms" is at most one
+        interval behind when served.
+        """
+        if interval is None:
+            interval = min(self._ttls.values())
+        interval = max(interval, MIN_CHECK_INTERVAL)
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health check refresh failed: {e}", exc_info=True)
+            await asyncio.sleep(interval)
+    
+    async def perform_all_checks(self) -> Dict[str, Any]:
+        """Perform all health checks (served from the shared snapshot)"""
+        return await self._get_snapshot()
+    
+    async def _get_snapshot(self) -> Dict[str, Any]:
+        """Return the latest health snapshot, computing it if none exists yet"""
+        if self._snapshot is None:
+            return await self.refresh()
+        return self._snapshot
+    
+    async def refresh(self) -> Dict[str, Any]:
+        """
+        Run all health checks and replace the snapshot.
+        Concurrent callers share the refresh already in flight instead of
+        starting another set of dependency checks.
+        """
+        # No await between the check and the assignment, so this is atomic
+        # on the event loop and needs no lock
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._refresh())
+        # Shield so a cancelled caller doesn't cancel the refresh for the others
+        return await asyncio.shield(self._inflight)
+    
+    async def _refresh(self) -> Dict[str, Any]:
+        """Run all health checks concurrently and build the snapshot"""
+        names = ("database", "redis", "memory")
+        results = await asyncio.gather(
             self.check_database(),
             self.check_redis(),
-            self.check_memory()
-        ]
+            self.check_memory(),
+            return_exceptions=True
+        )
+        # Keyed by check name so the probes can look up a single check directly
+        checks = {
+            name: {"name": name, "status": "unhealthy", "message": str(result)}
+            if isinstance(result, BaseException) else result
+            for name, result in zip(names, results)
+        }
         
         # Determine overall status
-        has_unhealthy = any(check["status"] == "unhealthy" for check in checks)
-        has_degraded = any(check["status"] == "degraded" for check in checks)
+        has_unhealthy = any(check["status"] == "unhealthy" for check in checks.values())
+        has_degraded = any(check["status"] == "degraded" for check in checks.values())
         
         if has_unhealthy:
             overall = "unhealthy"
@@ -164,32 +353,56 @@ class HealthCheckService:
         else:
             overall = "healthy"
         
-        return {
+        snapshot = {
             "overall": overall,
             "checks": checks,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "uptime": round(time.time() - self.start_time, 2)
+            "timestamp": now_iso(),
+            "uptime": round(time.monotonic() - self._start_monotonic, 2)
         }
+        self._body_cache = orjson.dumps({
+            "success": overall == "healthy",
+            "status": overall,
+            "timestamp": snapshot["timestamp"],
+            "uptime": snapshot["uptime"],
+            "environment": self._environment,
+            "version": "1.0.0",
+            "service": "intelligence",
+            "checks": list(checks.values()),
+        })
+        self._snapshot = snapshot
+        return snapshot
     
-    def is_ready(self) -> bool:
-        """Check if service is ready (all critical dependencies healthy)"""
-        db_check = self.check_database()
-        redis_check = self.check_redis()
+    async def quick_ready(self) -> bool:
+        """
+        Readiness as a boolean, checking dependencies in criticality order and
+        stopping at the first failure (no Redis call while the DB is down).
+        Memory is not a readiness criterion, so it is never checked here.
+        A set Redis maintenance key makes the instance not ready.
+        """
+        db_check = await self._cached("database", self._check_database)
+        if db_check["status"] != "healthy":
+            return False
         
+        redis_check = await self._cached("redis", self._check_redis)
         return (
-            db_check["status"] == "healthy" and
-            redis_check["status"] in ["healthy", "degraded"]
+            redis_check["status"] in ["healthy", "degraded"] and
+            not redis_check.get("maintenance", False)
         )
     
-    def is_alive(self) -> bool:
+    async def is_alive(self) -> bool:
         """Check if service is alive (basic liveness check)"""
-        memory_check = self.check_memory()
-        return memory_check["status"] != "unhealthy"
+        checks = (await self._get_snapshot())["checks"]
+        return checks["memory"]["status"] != "unhealthy"
+    
+    @property
+    def body_cache(self) -> bytes:
+        """Pre-serialized /health response body for the current snapshot"""
+        return self._body_cache
     
     @property
     def uptime(self) -> float:
         """Get service uptime in seconds"""
-        return round(time.time() - self.start_time, 2)
+        return round(time.monotonic() - self._start_monotonic, 2)
 
 
 # Global health check service instance
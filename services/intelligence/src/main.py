@@ -3,15 +3,17 @@ Intelligence Services - Main entry point
 Production-ready with health checks and structured logging
 """
 from fastapi import FastAPI, Request, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
-import os
+import orjson
 import logging
 import json
-from datetime import datetime
-from contextlib import asynccontextmanager
+import asyncio
+import time
+from contextlib import asynccontextmanager, suppress
 
-from health import health_service
+from config import Config
+from health import health_service, now_iso
 
 # Configure structured logging
 logging.basicConfig(
@@ -32,66 +34,85 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     logger.info("Intelligence service starting up", extra={
         "service": "intelligence",
-        "environment": os.getenv("ENV", "development"),
+        "environment": Config.ENV,
         "version": "1.0.0"
     })
+    # Health checks run in the background on their TTLs; probe endpoints only read the snapshot
+    health_task = asyncio.create_task(health_service.run_loop())
     yield
+    health_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await health_task
     logger.info("Intelligence service shutting down", extra={
         "service": "intelligence"
     })
 
 
+# Interactive docs and the OpenAPI schema are not served in production
+_DOCS_ENABLED = Config.ENV != "production"
+
 app = FastAPI(
     title="Intelligence Services",
     description="AI/ML services for the platform",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    docs_url="/docs" if _DOCS_ENABLED else None,
+    redoc_url="/redoc" if _DOCS_ENABLED else None,
+    openapi_url="/openapi.json" if _DOCS_ENABLED else None
 )
 
 
+def _request_log_fields(request: Request) -> dict:
+    """Fields shared by every log line of a request, built once and kept on request.state"""
+    fields = getattr(request.state, "log_fields", None)
+    if fields is None:
+        fields = {
+            "service": "intelligence",
+            "method": request.method,
+            "path": request.url.path,
+            "request_id": request.headers.get("x-request-id"),
+        }
+        request.state.log_fields = fields
+    return fields
+
+
 # Structured logging middleware
 @app.middleware("http")
 async def structured_logging_middleware(request: Request, call_next):
     """Structured logging middleware"""
-    start_time = datetime.utcnow()
+    start_time = time.perf_counter()
     
-    # Log request
-    logger.info("HTTP Request", extra={
-        "service": "intelligence",
-        "method": request.method,
-        "path": request.url.path,
-        "ip": request.client.host if request.client else None,
-        "user_agent": request.headers.get("user-agent"),
-        "request_id": request.headers.get("x-request-id"),
-    })
+    # Log request (skip building extra when INFO is filtered out)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("HTTP Request", extra={
+            **_request_log_fields(request),
+            "ip": request.client.host if request.client else None,
+            "user_agent": request.headers.get("user-agent"),
+        })
     
     try:
         response = await call_next(request)
-        process_time = (datetime.utcnow() - start_time).total_seconds() * 1000
+        process_time = (time.perf_counter() - start_time) * 1000.0
         
         # Log response
         log_level = logging.ERROR if response.status_code >= 500 else \
                    logging.WARN if response.status_code >= 400 else logging.INFO
         
-        logger.log(log_level, "HTTP Response", extra={
-            "service": "intelligence",
-            "method": request.method,
-            "path": request.url.path,
-            "status_code": response.status_code,
-            "response_time_ms": round(process_time, 2),
-            "request_id": request.headers.get("x-request-id"),
-        })
+        if logger.isEnabledFor(log_level):
+            logger.log(log_level, "HTTP Response", extra={
+                **_request_log_fields(request),
+                "status_code": response.status_code,
+                "response_time_ms": round(process_time, 2),
+            })
         
         return response
     except Exception as e:
-        process_time = (datetime.utcnow() - start_time).total_seconds() * 1000
+        process_time = (time.perf_counter() - start_time) * 1000.0
         logger.error("Request failed", extra={
-            "service": "intelligence",
-            "method": request.method,
-            "path": request.url.path,
+            **_request_log_fields(request),
             "error": str(e),
             "response_time_ms": round(process_time, 2),
-            "request_id": request.headers.get("x-request-id"),
         }, exc_info=True)
         raise
 
@@ -117,14 +138,14 @@ async def global_exception_handler(request: Request, exc: Exception):
         "request_id": request.headers.get("x-request-id"),
     })
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
             "error": {
                 "code": "INTERNAL_SERVER_ERROR",
                 "message": "An internal error occurred",
-                "timestamp": datetime.utcnow().isoformat() + "Z"
+                "timestamp": now_iso()
             }
         }
     )
@@ -133,54 +154,47 @@ async def global_exception_handler(request: Request, exc: Exception):
 @app.get("/health")
 async def health_check():
     """Comprehensive health check endpoint"""
-    health_data = health_service.perform_all_checks()
+    health_data = await health_service.perform_all_checks()
     
     status_code = 200 if health_data["overall"] in ["healthy", "degraded"] else 503
     
     logger.info("Health check performed", extra={
         "service": "intelligence",
         "overall": health_data["overall"],
-        "checks": [c["name"] for c in health_data["checks"]],
+        "checks": list(health_data["checks"]),
     })
     
-    return JSONResponse(
-        status_code=status_code,
-        content={
-            "success": health_data["overall"] == "healthy",
-            "status": health_data["overall"],
-            "timestamp": health_data["timestamp"],
-            "uptime": health_data["uptime"],
-            "environment": os.getenv("ENV", "development"),
-            "version": "1.0.0",
-            "service": "intelligence",
-            "checks": health_data["checks"],
-        }
+    # Body is serialized once per snapshot refresh, not per request
+    return Response(
+        content=health_service.body_cache,
+        media_type="application/json",
+        status_code=status_code
     )
 
 
 @app.get("/health/ready")
 async def readiness_probe():
     """Kubernetes readiness probe"""
-    is_ready = health_service.is_ready()
+    is_ready = await health_service.quick_ready()
     
     if is_ready:
         logger.debug("Readiness check passed", extra={"service": "intelligence"})
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "success": True,
                 "status": "ready",
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": now_iso(),
             }
         )
     else:
         logger.warn("Readiness check failed", extra={"service": "intelligence"})
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={
                 "success": False,
                 "status": "not ready",
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": now_iso(),
                 "message": "Service dependencies are not healthy",
             }
         )
@@ -189,48 +203,59 @@ async def readiness_probe():
 @app.get("/health/live")
 async def liveness_probe():
     """Kubernetes liveness probe"""
-    is_alive = health_service.is_alive()
+    is_alive = await health_service.is_alive()
     
     if is_alive:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "success": True,
                 "status": "alive",
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": now_iso(),
                 "uptime": health_service.uptime,
             }
         )
     else:
         logger.error("Liveness check failed", extra={"service": "intelligence"})
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "success": False,
                 "status": "dead",
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": now_iso(),
                 "message": "Service is not responding",
             }
         )
 
 
+# Constant payload, serialized once at import
+_API_V1_BODY = orjson.dumps({
+    "success": True,
+    "message": "Intelligence Services API v1",
+    "version": "1.0.0",
+    "service": "intelligence"
+})
+
+
 @app.get("/api/v1")
 async def api_info():
     """API information"""
-    return {
-        "success": True,
-        "message": "Intelligence Services API v1",
-        "version": "1.0.0",
-        "service": "intelligence"
-    }
+    return Response(content=_API_V1_BODY, media_type="application/json")
+
+
+# All routes are registered; build the schema once now instead of on the first docs hit
+if _DOCS_ENABLED:
+    app.openapi_schema = app.openapi()
 
 
 if __name__ == "__main__":
     import uvicorn
-    port = int(os.getenv("PORT", 8000))
+    port = Config.PORT
     uvicorn.run(
         app,
         host="0.0.0.0",
         port=port,
+        loop="uvloop",
+        http="httptools",
         log_config=None  # Use our custom logging
     )
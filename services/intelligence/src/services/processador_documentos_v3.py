@@ -8,22 +8,36 @@ Implementa:
 - Isolamento SaaS (Ref. Fonte 75): Suporte a tenant_id para isolamento de dados
 """
 
+import atexit
+import hashlib
 import logging
-import json
-from typing import Dict, Optional, List, Any
-from datetime import datetime
+import math
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Dict, Optional, List, Any, Iterator, Tuple
+from datetime import datetime, timezone
 from pathlib import Path
 import uuid
 
-try:
-    import pytesseract
+import orjson
+
+# NumPy, Pillow, PyMuPDF e tesserocr são importados nos métodos que
+# os usam: construir o processador ou serializar resultados não paga ~300ms de
+# imports (o Python guarda o módulo após o primeiro import)
+if TYPE_CHECKING:
+    import numpy as np
     from PIL import Image
-    from pdf2image import convert_from_path
-    import pdfplumber
-    from pdf2image.exceptions import PDFInfoNotInstalledError, PDFPageCountError
-except ImportError as e:
-    logging.error(f"Dependências não instaladas: {e}")
-    raise
+    from tesserocr import PyTessBaseAPI
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
 
 # Configuração de logging
 logger = logging.getLogger(__name__)
@@ -31,6 +45,14 @@ logger = logging.getLogger(__name__)
 # Constantes conforme Diretrizes GEMS
 DPI_MINIMO_REQUERIDO = 300  # Ref. Fontes 78 e 79
 
+# Fração mínima da página coberta por uma imagem para ela contar como o scan;
+# imagens menores (logotipo, assinatura, foto) não definem o DPI da página
+COBERTURA_MINIMA_SCAN = 0.5
+
+# Teto da rasterização para OCR: acima disso o texto fica maior que a altura
+# ótima do Tesseract e o custo cresce com dpi² sem ganho de precisão
+DPI_MAXIMO_OCR = 400
+
 # Spec §5.5 — CPO Hard Gate: 3 tiers de OCR (substitui threshold único)
 #   Tier 1 VERMELHO : confiança < OCR_REJEITAR_THRESHOLD  → rejeição imediata, intake bloqueado
 #   Tier 2 AMARELO  : OCR_REJEITAR_THRESHOLD ≤ confiança < OCR_APROVAR_THRESHOLD → fila revisão manual
@@ -38,6 +60,196 @@ DPI_MINIMO_REQUERIDO = 300  # Ref. Fontes 78 e 79
 OCR_REJEITAR_THRESHOLD = 70.0   # abaixo → VERMELHO (rejeitado)
 OCR_APROVAR_THRESHOLD  = 95.0   # acima/igual → VERDE (auto-aprovado)
 
+OCR_IDIOMA = 'por'  # Português
+
+# Páginas rasterizadas por vez no OCR: o pico de memória fica em ~PAGINAS_POR_LOTE
+# páginas (~10MB cada a 300 DPI, em tons de cinza), independente do tamanho do documento
+PAGINAS_POR_LOTE = 10
+
+# Cache de resultados por hash de conteúdo (um diretório por tenant, Ref. Fonte 75).
+# Alterar CACHE_VERSAO sempre que thresholds ou regras de validação mudarem.
+OCR_CACHE_DIR = os.getenv("OCR_CACHE_DIR", "./ocr_cache")
+CACHE_VERSAO = "cpo_v3.2"
+
+# Timestamps UTC em ISO 8601 (sufixo Z já no template)
+TIMESTAMP_FORMATO = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+def _hash_arquivo(caminho: str) -> str:
+    """
+    BLAKE2b do conteúdo do arquivo, lido via mmap
+    
+    O arquivo é mapeado em vez de copiado para bytes do Python: o kernel faz
+    o readahead e o hash não aloca memória proporcional ao tamanho do PDF.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(caminho, "rb", buffering=0) as f:
+        # mmap não aceita arquivo vazio
+        if os.fstat(f.fileno()).st_size == 0:
+            return h.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapa.madvise(mmap.MADV_SEQUENTIAL)
+            h.update(mapa)
+    return h.hexdigest()
+
+
+def _cache_get(cache: Optional["diskcache.Cache"], chave: Any) -> Any:
+    """Lê do cache; falha do cache vira miss em vez de falhar a validação"""
+    if cache is None:
+        return None
+    try:
+        return cache.get(chave)
+    except Exception as e:
+        logger.warning(f"Falha ao ler o cache OCR: {e}")
+        return None
+
+
+def _cache_set(cache: Optional["diskcache.Cache"], chave: Any, valor: Any) -> None:
+    """Grava no cache; falha do cache é registrada e ignorada"""
+    if cache is None:
+        return
+    try:
+        cache.set(chave, valor)
+    except Exception as e:
+        logger.warning(f"Falha ao gravar o cache OCR: {e}")
+
+
+# Definido nos workers de processar_lote: o paralelismo já é por documento,
+# então o OCR das páginas roda no próprio processo (sem pool aninhado)
+_OCR_INLINE = False
+
+
+def _usar_pool_ocr(n_paginas: int) -> bool:
+    """
+    Indica se o OCR do documento vai para o pool de processos: só com mais de
+    uma página, mais de um núcleo e fora dos workers de processar_lote
+    """
+    return not _OCR_INLINE and n_paginas > 1 and (os.cpu_count() or 1) > 1
+
+
+# Pool de OCR do processo, criado no primeiro documento com várias páginas e
+# reaproveitado pelos seguintes: cada worker carrega o traineddata uma única vez
+_pool_ocr: Optional[ProcessPoolExecutor] = None
+_pool_ocr_lock = threading.Lock()
+
+
+def _obter_pool_ocr() -> ProcessPoolExecutor:
+    """Retorna o pool de OCR do processo, criando-o (um worker por núcleo) no primeiro uso"""
+    global _pool_ocr
+    with _pool_ocr_lock:
+        if _pool_ocr is None:
+            _pool_ocr = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                initializer=_warm_tesseract
+            )
+        return _pool_ocr
+
+
+def _descartar_pool_ocr(pool_ocr: ProcessPoolExecutor) -> None:
+    """
+    Descarta um pool quebrado (worker morto por segfault ou OOM), para que o
+    próximo documento crie outro em vez de falhar com BrokenProcessPool
+    """
+    global _pool_ocr
+    with _pool_ocr_lock:
+        if _pool_ocr is pool_ocr:
+            _pool_ocr = None
+    pool_ocr.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def _encerrar_pool_ocr() -> None:
+    """Encerra o pool de OCR na saída do processo"""
+    with _pool_ocr_lock:
+        if _pool_ocr is not None:
+            _pool_ocr.shutdown(cancel_futures=True)
+
+
+# Uma instância do Tesseract por thread e idioma, criada sob demanda: o
+# traineddata é carregado uma única vez por thread, e a instância não é
+# serializável (por isso não fica no processador, que vai para os workers de
+# processar_lote). A PyTessBaseAPI guarda estado entre SetImage e
+# AllWordConfidences, então não pode ser compartilhada entre threads.
+_tess_local = threading.local()
+
+
+def _obter_tess_api(lang: str = OCR_IDIOMA) -> "PyTessBaseAPI":
+    """Retorna a instância do Tesseract da thread atual para o idioma"""
+    apis: Optional[Dict[str, "PyTessBaseAPI"]] = getattr(_tess_local, "apis", None)
+    if apis is None:
+        apis = _tess_local.apis = {}
+    
+    api = apis.get(lang)
+    if api is None:
+        from tesserocr import PyTessBaseAPI, PSM, OEM
+        
+        api = PyTessBaseAPI(lang=lang, psm=PSM.AUTO, oem=OEM.LSTM_ONLY)
+        apis[lang] = api
+    return api
+
+
+def _warm_tesseract() -> None:
+    """
+    Cria a instância do Tesseract do worker, para que o primeiro documento
+    não pague a carga do traineddata
+    """
+    try:
+        _obter_tess_api()
+    except Exception as e:
+        logger.warning(f"Falha ao pré-carregar o Tesseract: {e}")
+
+
+def _inicializar_worker_lote() -> None:
+    """Initializer dos processos de processar_lote"""
+    global _OCR_INLINE
+    _OCR_INLINE = True
+    _warm_tesseract()
+
+
+def _ocr_page(image: "Image.Image", lang: str = OCR_IDIOMA) -> "np.ndarray":
+    """
+    Executa o OCR de uma página e retorna a confiança de cada palavra
+    
+    Obtém o nível de confiança por palavra (Ref. Fonte 3) da instância do
+    Tesseract do processo, sem subprocesso nem recarga do modelo por página.
+    
+    Args:
+        image: Página rasterizada
+        lang: Idioma do Tesseract
+        
+    Returns:
+        Array int16 com as confianças por palavra reconhecida
+    """
+    import numpy as np
+    
+    api = _obter_tess_api(lang)
+    api.SetImage(image)
+    try:
+        # Só palavras: blocos sem texto (conf -1 no image_to_data) não entram
+        return np.asarray(api.AllWordConfidences(), dtype=np.int16)
+    finally:
+        api.Clear()
+
+
+def _ocr_page_bytes(
+    image_bytes: bytes,
+    size: Tuple[int, int],
+    mode: str,
+    lang: str = OCR_IDIOMA
+) -> "np.ndarray":
+    """
+    Versão de _ocr_page para processos worker: recebe os pixels crus em vez
+    do objeto PIL, que é mais caro de serializar entre processos
+    """
+    from PIL import Image
+    
+    image = Image.frombytes(mode, size, image_bytes)
+    try:
+        return _ocr_page(image, lang)
+    finally:
+        image.close()
+
 
 class ProcessadorDocumentosV3:
     """
@@ -45,16 +257,75 @@ class ProcessadorDocumentosV3:
     conforme Diretrizes GEMS
     """
 
-    def __init__(self, tenant_id: Optional[str] = None):
+    def __init__(
+        self,
+        tenant_id: Optional[str] = None,
+        diretorio_cache: Optional[str] = OCR_CACHE_DIR,
+        skip_ocr_on_low_dpi: bool = True
+    ):
         """
         Inicializa o processador de documentos
         
         Args:
             tenant_id: Identificador do tenant para isolamento SaaS (Ref. Fonte 75)
+            diretorio_cache: Raiz do cache de resultados OCR (None desativa o cache;
+                sem tenant_id o cache também fica desativado)
+            skip_ocr_on_low_dpi: Não executar o OCR quando o DPI estiver abaixo
+                de metade do mínimo (o documento vai direto para triagem manual)
         """
         self.tenant_id = tenant_id or str(uuid.uuid4())
+        # O uuid gerado para chamadas anônimas nunca se repete: um cache nesse
+        # namespace jamais teria acerto e só acumularia diretórios em disco
+        self._tenant_anonimo = tenant_id is None
+        self.diretorio_cache = diretorio_cache if DISKCACHE_AVAILABLE else None
+        self._caches: Dict[str, "diskcache.Cache"] = {}
+        self.skip_ocr_on_low_dpi = skip_ocr_on_low_dpi
         logger.info(f"Processador inicializado para tenant_id: {self.tenant_id}")
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # Os handles do diskcache não vão para os workers de processar_lote;
+        # cada processo reabre o cache do tenant (o diskcache é seguro entre processos)
+        estado = self.__dict__.copy()
+        estado["_caches"] = {}
+        return estado
+
+    def _obter_cache(self, tenant_id: str) -> Optional["diskcache.Cache"]:
+        """
+        Retorna o cache do tenant, isolado em um diretório próprio (Ref. Fonte 75)
+        
+        O nome do diretório é o hash do tenant_id, nunca o valor recebido: um
+        tenant_id como "../outro" não sai da raiz do cache nem alcança outro tenant.
+        
+        Args:
+            tenant_id: Identificador do tenant
+            
+        Returns:
+            Cache do tenant ou None se o cache estiver desativado, o tenant
+            for o anônimo gerado no construtor, ou o cache estiver indisponível
+            (o processamento segue sem cache)
+        """
+        if self.diretorio_cache is None:
+            return None
+        
+        if self._tenant_anonimo and tenant_id == self.tenant_id:
+            return None
+        
+        if tenant_id not in self._caches:
+            diretorio_tenant = hashlib.blake2b(
+                tenant_id.encode("utf-8"), digest_size=16
+            ).hexdigest()
+            try:
+                self._caches[tenant_id] = diskcache.Cache(
+                    os.path.join(self.diretorio_cache, diretorio_tenant)
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Cache OCR indisponível em {self.diretorio_cache}, "
+                    f"seguindo sem cache: {e}"
+                )
+                return None
+        return self._caches[tenant_id]
+
     def validar_cpo(
         self,
         caminho_pdf: str,
@@ -81,7 +352,7 @@ class ProcessadorDocumentosV3:
         resultado = {
             "tenant_id": tenant_id,
             "arquivo": caminho_pdf,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.now(timezone.utc).strftime(TIMESTAMP_FORMATO),
             "status_cpo": None,
             "validacoes": {
                 "dpi": {
@@ -93,7 +364,9 @@ class ProcessadorDocumentosV3:
                 "ocr_confidence": {
                     "aprovado": False,
                     "confianca_media": None,
-                    "confianca_minima_requerida": CONFIANCA_OCR_MINIMA,
+                    "confianca_minima_requerida": OCR_APROVAR_THRESHOLD,
+                    "tier": None,
+                    "parcial": False,
                     "mensagem": None
                 }
             },
@@ -102,17 +375,42 @@ class ProcessadorDocumentosV3:
         }
 
         try:
-            # Validação 1: DPI (Ref. Fontes 78 e 79)
-            dpi_resultado = self._validar_dpi(caminho_pdf)
-            resultado["validacoes"]["dpi"] = dpi_resultado
+            # Revalidações do mesmo arquivo (retry, reprocessamento, auditoria CPO)
+            # reaproveitam o resultado pelo hash do conteúdo
+            cache = self._obter_cache(tenant_id)
+            chave_cache = None
+            if cache is not None:
+                try:
+                    chave_cache = (
+                        _hash_arquivo(caminho_pdf), CACHE_VERSAO, self.skip_ocr_on_low_dpi
+                    )
+                except (OSError, ValueError) as e:
+                    # O hash só serve à chave do cache (ex.: mmap sem suporte no
+                    # sistema de arquivos): a validação segue sem cache
+                    logger.warning(f"Falha ao calcular o hash do arquivo, seguindo sem cache: {e}")
+                    cache = None
+            validacoes = _cache_get(cache, chave_cache)
+            
+            if validacoes is not None:
+                logger.info(f"Validação CPO obtida do cache para tenant_id: {tenant_id}")
+            else:
+                validacoes = self._executar_validacoes(caminho_pdf, cache)
+                # Só resultados completos são reaproveitados: erro ao abrir/rasterizar
+                # (sem tier ou sem DPI) ou OCR parcial seria servido a todo retry
+                ocr = validacoes["ocr_confidence"]
+                if (
+                    ocr.get("tier") is not None
+                    and not ocr.get("parcial")
+                    and validacoes["dpi"].get("dpi_detectado") is not None
+                ):
+                    _cache_set(cache, chave_cache, validacoes)
             
-            # Validação 2: Confiança OCR (Ref. Fonte 3)
-            ocr_resultado = self._validar_confianca_ocr(caminho_pdf)
-            resultado["validacoes"]["ocr_confidence"] = ocr_resultado
+            resultado["validacoes"] = validacoes
             
             # Spec §5.5 — Determinar status CPO final baseado em 3 tiers
             dpi_aprovado = resultado["validacoes"]["dpi"]["aprovado"]
-            ocr_tier = resultado["validacoes"]["ocr_confidence"].get("tier", "VERMELHO")
+            # Sem tier (erro no OCR) conta como VERMELHO, nunca como VERDE
+            ocr_tier = resultado["validacoes"]["ocr_confidence"].get("tier") or "VERMELHO"
 
             if ocr_tier == "VERMELHO":
                 # Hard reject — OCR abaixo de 70%
@@ -143,6 +441,99 @@ class ProcessadorDocumentosV3:
         
         return resultado
 
+    def _executar_validacoes(
+        self,
+        caminho_pdf: str,
+        cache: Optional["diskcache.Cache"] = None
+    ) -> Dict[str, Any]:
+        """
+        Executa as validações de DPI e de confiança OCR do documento
+        
+        Args:
+            caminho_pdf: Caminho para o arquivo PDF
+            cache: Cache do tenant para resultados de OCR por página
+            
+        Returns:
+            Dict com os resultados "dpi" e "ocr_confidence"
+        """
+        # Validação 1: DPI (Ref. Fontes 78 e 79) — lido dos metadados, sem rasterizar
+        dpi_resultado = self._validar_dpi(caminho_pdf)
+        
+        # Validação 2: Confiança OCR (Ref. Fonte 3) — única etapa que rasteriza
+        dpi_detectado = dpi_resultado["dpi_detectado"]
+        if (
+            self.skip_ocr_on_low_dpi
+            and dpi_detectado is not None
+            and dpi_detectado < DPI_MINIMO_REQUERIDO // 2
+        ):
+            # Scan muito abaixo do mínimo: a confiança do OCR não seria confiável,
+            # então a etapa mais cara é pulada. Sem medição não há base para rejeitar:
+            # tier AMARELO mantém o destino de um DPI reprovado (triagem manual)
+            logger.info(f"OCR ignorado: DPI {dpi_detectado} < {DPI_MINIMO_REQUERIDO // 2}")
+            ocr_resultado = {
+                "aprovado": False,
+                "confianca_media": None,
+                "confianca_minima_requerida": OCR_APROVAR_THRESHOLD,
+                "tier": "AMARELO",
+                "parcial": False,
+                "mensagem": (
+                    f"OCR não executado: DPI {dpi_detectado} muito baixo para "
+                    f"estimativa confiável de confiança (< {DPI_MINIMO_REQUERIDO // 2} DPI) "
+                    f"— encaminhado para triagem manual (Spec §5.5 Tier 2)"
+                )
+            }
+        else:
+            # Rasterizar na resolução do scan (entre o mínimo e o teto), em vez de
+            # reamostrar sempre para 300 DPI
+            ocr_dpi = min(
+                max(dpi_detectado or DPI_MINIMO_REQUERIDO, DPI_MINIMO_REQUERIDO),
+                DPI_MAXIMO_OCR
+            )
+            ocr_resultado = self._validar_confianca_ocr(caminho_pdf, cache, dpi=ocr_dpi)
+        
+        return {
+            "dpi": dpi_resultado,
+            "ocr_confidence": ocr_resultado
+        }
+
+    def _render_pages(
+        self,
+        caminho_pdf: str,
+        dpi: int,
+        primeira: int = 0,
+        ultima: Optional[int] = None
+    ) -> List["Image.Image"]:
+        """
+        Rasteriza páginas do PDF em processo com PyMuPDF
+        
+        Evita o fork do pdftoppm e a serialização de PPMs em disco do pdf2image.
+        As páginas saem em tons de cinza: o Tesseract converte para cinza
+        internamente de qualquer forma, e cada página ocupa 1/3 dos bytes do RGB.
+        
+        Args:
+            caminho_pdf: Caminho para o arquivo PDF
+            dpi: Resolução de renderização
+            primeira: Índice (base 0) da primeira página
+            ultima: Índice final exclusivo (None = até o fim)
+            
+        Returns:
+            Lista de imagens PIL (modo "L"), uma por página
+        """
+        import fitz  # PyMuPDF
+        from PIL import Image
+        
+        zoom = dpi / 72
+        matriz = fitz.Matrix(zoom, zoom)
+        images = []
+        
+        with fitz.open(caminho_pdf) as doc:
+            fim = doc.page_count if ultima is None else min(ultima, doc.page_count)
+            for numero in range(primeira, fim):
+                pix = doc[numero].get_pixmap(matrix=matriz, colorspace=fitz.csGRAY, alpha=False)
+                images.append(Image.frombytes("L", (pix.width, pix.height), pix.samples))
+        
+        return images
+
     def _validar_dpi(self, caminho_pdf: str) -> Dict[str, Any]:
         """
         Valida a resolução DPI do PDF (Ref. Fontes 78 e 79)
@@ -163,7 +554,7 @@ class ProcessadorDocumentosV3:
         }
         
         try:
-            # Extrair DPI do PDF usando pdfplumber
+            # Extrair DPI do PDF a partir dos metadados das imagens
             dpi_detectado = self._extrair_dpi_pdf(caminho_pdf)
             
             resultado["dpi_detectado"] = dpi_detectado
@@ -203,43 +594,27 @@ class ProcessadorDocumentosV3:
         Returns:
             DPI detectado ou None se não for possível detectar
         """
+        import fitz  # PyMuPDF
+        
         try:
-            # Método 1: Tentar extrair usando pdfplumber
-            with pdfplumber.open(caminho_pdf) as pdf:
-                if len(pdf.pages) > 0:
-                    primeira_pagina = pdf.pages[0]
-                    # Tentar obter informações da página
-                    # Nota: pdfplumber não fornece DPI diretamente, então usamos método alternativo
-                    pass
-            
-            # Método 2: Converter primeira página para imagem e verificar DPI
-            # Usando pdf2image com DPI padrão e verificando metadados
-            try:
-                images = convert_from_path(
-                    caminho_pdf,
-                    dpi=DPI_MINIMO_REQUERIDO,
-                    first_page=1,
-                    last_page=1
-                )
+            # Método 1: DPI real dos scans embutidos, lido dos metadados de cada página
+            # (sem rasterizar). O documento vale pela pior página escaneada.
+            with fitz.open(caminho_pdf) as doc:
+                dpis_paginas = [
+                    dpi for page in doc
+                    if (dpi := self._dpi_imagem_embutida(
+                        page.get_image_info(),
+                        page.rect.width * page.rect.height
+                    )) is not None
+                ]
+                if dpis_paginas:
+                    return min(dpis_paginas)
                 
-                if images:
-                    # Verificar DPI da imagem convertida
-                    # Quando convertemos com dpi específico, assumimos que o PDF original
-                    # tem pelo menos essa resolução se a conversão for bem-sucedida
-                    # Para uma detecção mais precisa, precisaríamos analisar os metadados do PDF
-                    img = images[0]
-                    
-                    # Tentar obter DPI dos metadados da imagem
-                    # PIL não armazena DPI diretamente, então verificamos o tamanho
-                    # e assumimos que se a conversão foi bem-sucedida, o PDF tem resolução adequada
-                    
-                    # Para uma detecção mais precisa, vamos usar uma abordagem diferente:
-                    # Converter com diferentes DPIs e verificar qual produz melhor resultado
-                    return self._detectar_dpi_por_tamanho(caminho_pdf)
-                    
-            except (PDFInfoNotInstalledError, PDFPageCountError) as e:
-                logger.warning(f"Erro ao converter PDF para imagem: {e}")
-                return None
+                # Método 2: Nenhuma página escaneada (PDF digital) — não há
+                # resolução de scan: o texto é rasterizado para o OCR em qualquer
+                # DPI, então o documento atende ao mínimo por definição
+                if doc.page_count > 0:
+                    return DPI_MINIMO_REQUERIDO
             
         except Exception as e:
             logger.error(f"Erro ao extrair DPI: {e}", exc_info=True)
@@ -247,53 +622,174 @@ class ProcessadorDocumentosV3:
         
         return None
 
-    def _detectar_dpi_por_tamanho(self, caminho_pdf: str) -> Optional[int]:
+    @staticmethod
+    def _dpi_imagem_embutida(
+        imagens: List[Dict[str, Any]],
+        area_pagina: float
+    ) -> Optional[int]:
         """
-        Detecta DPI estimado baseado no tamanho da página convertida
+        Calcula o DPI da maior imagem embutida na página (o scan)
+        
+        A imagem só conta como scan se cobrir ao menos COBERTURA_MINIMA_SCAN da
+        página; numa página digital, um logotipo ou assinatura não é o scan.
+        
+        DPI = pixels da imagem / tamanho exibido em polegadas (pontos / 72).
+        O tamanho exibido de cada lado vem da matriz de transformação da imagem,
+        não do bbox: um scan girado (paisagem em página retrato) tem largura e
+        altura trocadas em relação ao bbox.
         
         Args:
-            caminho_pdf: Caminho para o arquivo PDF
+            imagens: Resultado de page.get_image_info() do PyMuPDF
+            area_pagina: Área da página (page.rect) em pontos²
             
         Returns:
-            DPI estimado ou None
+            DPI do scan ou None se a página não tiver imagem que seja o scan
         """
-        try:
-            # Converter com DPI conhecido e verificar dimensões
-            # Uma página A4 em 300 DPI tem aproximadamente 2480x3508 pixels
-            images_300 = convert_from_path(
-                caminho_pdf,
-                dpi=300,
-                first_page=1,
-                last_page=1
-            )
+        maior = None
+        maior_area = 0.0
+        for info in imagens:
+            a, b, c, d, _, _ = info["transform"]
+            # |det| = área exibida em pontos², qualquer que seja a rotação
+            area = abs(a * d - b * c)
+            if area > maior_area:
+                maior, maior_area = info, area
+        
+        if maior is None or maior_area < COBERTURA_MINIMA_SCAN * area_pagina:
+            return None
+        
+        # A matriz leva o quadrado unitário da imagem à página: (a, b) é o lado
+        # da largura em pixels e (c, d) o lado da altura, já em pontos
+        a, b, c, d, _, _ = maior["transform"]
+        return min(
+            ProcessadorDocumentosV3._calcular_dpi(maior["width"], math.hypot(a, b)),
+            ProcessadorDocumentosV3._calcular_dpi(maior["height"], math.hypot(c, d))
+        )
+
+    @staticmethod
+    def _calcular_dpi(pixels: int, pontos: float) -> int:
+        """
+        Calcula o DPI exato de uma dimensão, independente do tamanho do papel
+        
+        Args:
+            pixels: Tamanho em pixels
+            pontos: Tamanho exibido em pontos PDF (1/72 de polegada)
             
-            if images_300:
-                width, height = images_300[0].size
-                # Para A4 em 300 DPI: ~2480x3508
-                # Se as dimensões são próximas, assumimos 300 DPI
-                if width >= 2000 and height >= 2500:
-                    return 300
-                # Se menor, provavelmente é menor DPI
-                elif width >= 1000 and height >= 1400:
-                    return 150
-                else:
-                    return 72  # DPI padrão baixo
+        Returns:
+            DPI (pixels por polegada)
+        """
+        return round(pixels * 72 / pontos)
+
+    def _ocr_paginas(
+        self,
+        images: List["Image.Image"],
+        cache: Optional["diskcache.Cache"] = None,
+        primeira: int = 0,
+        executor: Optional[ProcessPoolExecutor] = None
+    ) -> Iterator[Tuple[int, "np.ndarray"]]:
+        """
+        Executa o OCR das páginas, reaproveitando páginas já processadas
+        
+        Com cache, cada página é identificada pelo hash dos pixels renderizados,
+        então uma reexecução parcial só faz OCR das páginas que mudaram.
+        
+        Args:
+            images: Páginas rasterizadas (liberadas após o envio ao OCR)
+            cache: Cache do tenant (opcional)
+            primeira: Índice no documento da primeira página de `images`
+            executor: Pool de OCR do processo (None = OCR no próprio processo)
             
-        except Exception as e:
-            logger.warning(f"Erro ao detectar DPI por tamanho: {e}")
+        Yields:
+            Tupla (índice da página, confianças por palavra)
+        """
+        # Páginas vazias são descartadas antes do OCR, em vez de falharem nele
+        validas = [
+            (idx, image) for idx, image in enumerate(images, start=primeira)
+            if image.size[0] > 0 and image.size[1] > 0
+        ]
         
-        # Se não conseguir detectar, retorna None (será tratado como erro)
-        return None
+        pendentes = []
+        for idx, image in validas:
+            chave = None
+            if cache is not None:
+                digest = hashlib.blake2b(image.tobytes(), digest_size=16).hexdigest()
+                chave = (digest, f"{CACHE_VERSAO}:pagina")
+                confiancas_pagina = _cache_get(cache, chave)
+                if confiancas_pagina is not None:
+                    image.close()
+                    yield idx, confiancas_pagina
+                    continue
+            pendentes.append((idx, image, chave))
+        
+        for idx, confiancas_pagina, chave in self._executar_ocr(pendentes, executor):
+            if chave is not None:
+                _cache_set(cache, chave, confiancas_pagina)
+            yield idx, confiancas_pagina
 
-    def _validar_confianca_ocr(self, caminho_pdf: str) -> Dict[str, Any]:
+    def _executar_ocr(
+        self,
+        pendentes: List[Tuple[int, "Image.Image", Any]],
+        executor: Optional[ProcessPoolExecutor] = None
+    ) -> Iterator[Tuple[int, "np.ndarray", Any]]:
+        """
+        Executa o OCR das páginas, em paralelo quando há um pool
+        
+        O OCR é CPU-bound; com ProcessPoolExecutor cada página usa um núcleo.
+        Falhas do OCR são propagadas para _validar_confianca_ocr.
+        
+        Args:
+            pendentes: Tuplas (índice, página, chave de cache); as páginas são
+                liberadas após o envio ao OCR
+            executor: Pool de OCR do processo, reaproveitado entre lotes e
+                documentos (None = OCR no próprio processo)
+            
+        Yields:
+            Tupla (índice, confianças por palavra, chave de cache), na ordem de conclusão
+        """
+        if executor is None:
+            for idx, image, chave in pendentes:
+                confiancas_pagina = _ocr_page(image)
+                # Libera a página assim que o OCR termina para limitar o RSS
+                image.close()
+                yield idx, confiancas_pagina, chave
+            return
+        
+        futures = {}
+        try:
+            for idx, image, chave in pendentes:
+                future = executor.submit(_ocr_page_bytes, image.tobytes(), image.size, image.mode)
+                futures[future] = (idx, chave)
+                image.close()
+            
+            for future in as_completed(futures):
+                idx, chave = futures[future]
+                yield idx, future.result(), chave
+        finally:
+            # O pool é compartilhado: numa falha, só as páginas deste documento
+            # que ainda não começaram são canceladas
+            for future in futures:
+                future.cancel()
+
+    def _validar_confianca_ocr(
+        self,
+        caminho_pdf: str,
+        cache: Optional["diskcache.Cache"] = None,
+        dpi: int = DPI_MINIMO_REQUERIDO
+    ) -> Dict[str, Any]:
         """
         Valida a confiança média do OCR (Ref. Fonte 3)
         
-        Usa image_to_data para calcular confiança média.
+        Usa as confianças por palavra do Tesseract para calcular a média.
         Se média < 95%, documento é marcado para revisão.
         
+        As páginas são rasterizadas e processadas em lotes de PAGINAS_POR_LOTE
+        para limitar o pico de memória em documentos longos. Uma falha do OCR
+        interrompe o documento: a média considera as páginas já processadas,
+        a validação é marcada como parcial e não pode ser aprovada automaticamente.
+        
         Args:
             caminho_pdf: Caminho para o arquivo PDF
+            cache: Cache do tenant para resultados de OCR por página
+            dpi: Resolução de rasterização das páginas
             
         Returns:
             Dict com resultado da validação de confiança OCR
@@ -303,59 +799,65 @@ class ProcessadorDocumentosV3:
             "confianca_media": None,
             "confianca_minima_requerida": OCR_APROVAR_THRESHOLD,
             "tier": None,  # VERMELHO | AMARELO | VERDE
+            "parcial": False,  # OCR interrompido antes da última página
             "mensagem": None
         }
         
+        import fitz  # PyMuPDF
+        import numpy as np
+        
         try:
-            # Converter PDF para imagens
-            images = convert_from_path(
-                caminho_pdf,
-                dpi=DPI_MINIMO_REQUERIDO
-            )
+            with fitz.open(caminho_pdf) as doc:
+                n_paginas = doc.page_count
             
-            if not images:
+            if n_paginas == 0:
                 resultado["mensagem"] = "Não foi possível converter PDF para imagens"
                 return resultado
             
-            # Calcular confiança média usando image_to_data (Ref. Fonte 3)
-            confiancas = []
+            # Calcular confiança média pelas confianças por palavra (Ref. Fonte 3)
+            confiancas_por_pagina = []
             
-            for idx, image in enumerate(images):
-                try:
-                    # Usar image_to_data para obter dados detalhados do OCR
-                    # Incluindo nível de confiança por palavra
-                    dados_ocr = pytesseract.image_to_data(
-                        image,
-                        output_type=pytesseract.Output.DICT,
-                        lang='por'  # Português
+            # Pool do processo, reaproveitado entre lotes e documentos. Página única
+            # (ou worker de processar_lote) faz o OCR no próprio processo.
+            executor = _obter_pool_ocr() if _usar_pool_ocr(n_paginas) else None
+            
+            try:
+                for inicio in range(0, n_paginas, PAGINAS_POR_LOTE):
+                    lote = self._render_pages(
+                        caminho_pdf,
+                        dpi,
+                        primeira=inicio,
+                        ultima=inicio + PAGINAS_POR_LOTE
                     )
                     
-                    # Extrair confianças (conf) dos dados
-                    # conf é um campo no output do image_to_data
-                    confiancas_pagina = [
-                        int(conf) for conf in dados_ocr.get('conf', [])
-                        if conf != '-1'  # -1 indica que não foi possível detectar
-                    ]
-                    
-                    if confiancas_pagina:
-                        confiancas.extend(confiancas_pagina)
-                    
-                    logger.debug(
-                        f"Página {idx + 1}: {len(confiancas_pagina)} palavras detectadas, "
-                        f"confiança média: {sum(confiancas_pagina) / len(confiancas_pagina):.2f}%"
-                    )
+                    for idx, confiancas_pagina in self._ocr_paginas(
+                        lote, cache, primeira=inicio, executor=executor
+                    ):
+                        if confiancas_pagina.size == 0:
+                            continue
+                        
+                        confiancas_por_pagina.append(confiancas_pagina)
+                        
+                        logger.debug(
+                            f"Página {idx + 1}: {confiancas_pagina.size} palavras detectadas, "
+                            f"confiança média: {confiancas_pagina.mean():.2f}%"
+                        )
                     
-                except Exception as e:
-                    logger.warning(f"Erro ao processar página {idx + 1} para OCR: {e}")
-                    continue
+                    # As páginas do lote já foram liberadas pelo OCR
+                    del lote
+            except Exception as e:
+                logger.error(f"Erro no OCR, validação parcial: {e}", exc_info=True)
+                resultado["parcial"] = True
+                if isinstance(e, BrokenProcessPool) and executor is not None:
+                    _descartar_pool_ocr(executor)
             
-            if not confiancas:
+            if not confiancas_por_pagina:
                 resultado["mensagem"] = "Não foi possível extrair dados de confiança OCR"
                 resultado["aprovado"] = False
                 return resultado
             
-            # Calcular confiança média
-            confianca_media = sum(confiancas) / len(confiancas)
+            # Calcular confiança média (redução vetorizada sobre todas as palavras)
+            confianca_media = float(np.concatenate(confiancas_por_pagina).mean())
             resultado["confianca_media"] = round(confianca_media, 2)
             
             # Spec §5.5 — 3-tier hard gate OCR
@@ -385,6 +887,18 @@ class ProcessadorDocumentosV3:
                     f"— processamento automático (Spec §5.5 Tier 3)"
                 )
             
+            if resultado["parcial"]:
+                if resultado["tier"] == "VERDE":
+                    # Páginas sem OCR: não há base para aprovação automática
+                    resultado["aprovado"] = False
+                    resultado["tier"] = "AMARELO"
+                    resultado["mensagem"] = (
+                        f"OCR PARCIAL: confiança {confianca_media:.2f}% nas páginas processadas "
+                        f"— encaminhado para triagem manual (Spec §5.5 Tier 2)"
+                    )
+                else:
+                    resultado["mensagem"] += " [validação parcial: falha no OCR]"
+            
             logger.info(
                 f"Validação OCR: confiança média {confianca_media:.2f}% - "
                 f"{'Aprovado' if resultado['aprovado'] else 'Reprovado'}"
@@ -419,7 +933,7 @@ class ProcessadorDocumentosV3:
         resultado = {
             "tenant_id": tenant_id,
             "arquivo": caminho_pdf,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.now(timezone.utc).strftime(TIMESTAMP_FORMATO),
             "processamento": {
                 "status": "iniciado",
                 "validacao_cpo": None
@@ -445,6 +959,106 @@ class ProcessadorDocumentosV3:
         
         return resultado
 
+    def processar_lote(
+        self,
+        caminhos: List[str],
+        workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Processa vários documentos em paralelo, um documento por processo
+        
+        Cada worker pré-carrega o Tesseract uma única vez e compartilha com os
+        demais o cache em disco do tenant (Ref. Fonte 75). Um documento cujo
+        worker falha (segfault nativo, OOM) vira uma entrada com status "erro";
+        os demais resultados são preservados.
+        
+        Args:
+            caminhos: Caminhos dos arquivos PDF
+            workers: Número de processos (padrão: um por núcleo)
+            
+        Returns:
+            Lista, na ordem de `caminhos`, com um dict por arquivo: filename,
+            status, time_ms e o resultado completo do processamento
+        """
+        if not caminhos:
+            return []
+        
+        max_workers = workers or min(os.cpu_count() or 1, len(caminhos))
+        logger.info(
+            f"Iniciando lote de {len(caminhos)} documentos para tenant_id: {self.tenant_id}, "
+            f"workers: {max_workers}"
+        )
+        
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_inicializar_worker_lote
+        ) as executor:
+            # Um documento por tarefa: cada um leva segundos, então agrupar
+            # deixaria workers ociosos enquanto outros ainda têm fila
+            futures = [executor.submit(self._process_one, caminho) for caminho in caminhos]
+            
+            resultados = []
+            for caminho, future in zip(caminhos, futures):
+                try:
+                    resultados.append(future.result())
+                except Exception as e:
+                    # BrokenProcessPool e afins chegam aqui; os documentos já
+                    # concluídos mantêm seus resultados
+                    logger.error(f"Erro no worker do lote para o arquivo {caminho}: {e}")
+                    resultados.append(self._resultado_falha_lote(caminho, e))
+            return resultados
+
+    def _process_one(self, caminho_pdf: str) -> Dict[str, Any]:
+        """
+        Processa um documento do lote e mede o tempo gasto
+        
+        Args:
+            caminho_pdf: Caminho para o arquivo PDF
+            
+        Returns:
+            Dict com filename, status, time_ms e resultado
+        """
+        inicio = time.perf_counter()
+        resultado = self.processar_documento(caminho_pdf)
+        
+        return {
+            "filename": os.path.basename(caminho_pdf),
+            "status": resultado["processamento"]["status"],
+            "time_ms": round((time.perf_counter() - inicio) * 1000, 2),
+            "resultado": resultado
+        }
+
+    def _resultado_falha_lote(self, caminho_pdf: str, erro: Exception) -> Dict[str, Any]:
+        """
+        Entrada de processar_lote para um documento cujo worker falhou, no
+        mesmo formato de _process_one
+        
+        Args:
+            caminho_pdf: Caminho para o arquivo PDF
+            erro: Exceção obtida do future
+            
+        Returns:
+            Dict com filename, status "erro", time_ms None e resultado
+        """
+        return {
+            "filename": os.path.basename(caminho_pdf),
+            "status": "erro",
+            "time_ms": None,
+            "resultado": {
+                "tenant_id": self.tenant_id,
+                "arquivo": caminho_pdf,
+                "timestamp": datetime.now(timezone.utc).strftime(TIMESTAMP_FORMATO),
+                "processamento": {
+                    "status": "erro",
+                    "validacao_cpo": None
+                },
+                "erros": [{
+                    "tipo": type(erro).__name__,
+                    "mensagem": str(erro)
+                }]
+            }
+        }
+
     def gerar_json_saida(
         self,
         resultado_validacao: Dict[str, Any]
@@ -458,7 +1072,29 @@ class ProcessadorDocumentosV3:
         Returns:
             JSON string formatado
         """
-        return json.dumps(resultado_validacao, indent=2, ensure_ascii=False)
+        return orjson.dumps(
+            resultado_validacao,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+    def gerar_ndjson_lote(
+        self,
+        resultados_lote: List[Dict[str, Any]]
+    ) -> str:
+        """
+        Gera a saída de processar_lote em NDJSON: um documento JSON compacto
+        por linha, que o consumidor pode ler linha a linha
+        
+        Args:
+            resultados_lote: Resultados retornados por processar_lote
+            
+        Returns:
+            String NDJSON (vazia para lote vazio)
+        """
+        return "".join(
+            orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS).decode()
+            for item in resultados_lote
+        )
 
 
 # Função de conveniência para uso direto
@@ -480,6 +1116,26 @@ def processar_documento(
     return processador.processar_documento(caminho_pdf, tenant_id)
 
 
+def processar_documentos_lote(
+    caminhos: List[str],
+    tenant_id: Optional[str] = None,
+    workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Função de conveniência para processar um lote de documentos
+    
+    Args:
+        caminhos: Caminhos dos arquivos PDF
+        tenant_id: Identificador do tenant (Ref. Fonte 75)
+        workers: Número de processos (padrão: um por núcleo)
+        
+    Returns:
+        Lista de resultados por arquivo, na ordem de `caminhos`
+    """
+    processador = ProcessadorDocumentosV3(tenant_id=tenant_id)
+    return processador.processar_lote(caminhos, workers)
+
+
 # Exemplo de uso
 if __name__ == "__main__":
     import sys